@@ -1,9 +1,15 @@
 # app.py
+import base64
 import json
 import html
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Protocol, Set
-
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Protocol, Set, Tuple
+
+import fastjsonschema
+import orjson
 import streamlit as st
 
 
@@ -14,6 +20,10 @@ class DataProvider(Protocol):
         """Return raw image bytes (png/jpg/webp) suitable for st.image(bytes)."""
         ...
 
+    def get_images(self, image_ids: List[int]) -> Dict[int, bytes]:
+        """Batch get_image: one round trip for all ids, returns {image_id: bytes}."""
+        ...
+
     def go_to(self, message_id: int) -> None:
         """Navigate to message_id (query params / session_state / whatever you decide)."""
         ...
@@ -31,13 +41,24 @@ class DataProvider(Protocol):
 # ---------------- JSON model ----------------
 # translate placed at the END, as requested
 
-@dataclass
+@dataclass(slots=True)
 class Link:
     id: int                                  # message_id in sqlite
     title: str                               # native title
     translate: Dict[str, str]                # lang -> title   (optional)
+    # Derived from translate, built eagerly so it is part of the cached parse
+    # result. Call refresh() after mutating translate (add_translation only
+    # touches Message, so nothing does today).
+    sorted_langs: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.refresh()
 
-@dataclass
+    def refresh(self):
+        # render order of translations
+        self.sorted_langs = tuple(sorted(self.translate))
+
+@dataclass(slots=True)
 class Message:
     id: int
     image_id: Optional[int]
@@ -45,43 +66,125 @@ class Message:
     links: List[Link]
     translate: Dict[str, str]                # lang -> text    (optional)
 
+@dataclass(slots=True)
+class ParsedFeed:
+    messages: List[Message]                  # in payload order
+    by_id: Dict[int, Message]                # same objects, indexed by id
+
 
 # ---------------- Parsing ----------------
 
-def _parse_lang_map(obj: Any, ctx: str) -> Dict[str, str]:
-    if obj is None:
-        return {}
-    if not isinstance(obj, dict):
-        raise ValueError(f"{ctx} must be an object/dict {{lang: text}}")
-    out: Dict[str, str] = {}
-    for k, v in obj.items():
-        if not isinstance(k, str) or not k:
-            raise ValueError(f"{ctx} keys must be non-empty strings (lang codes)")
-        if not isinstance(v, str) or v == "":
-            raise ValueError(f"{ctx}[{k}] must be a non-empty string")
-        out[k] = v
-    return out
-
-def _parse_links(obj: Any, ctx: str) -> List[Link]:
-    if obj is None:
-        return []
-    if not isinstance(obj, list):
-        raise ValueError(f"{ctx} must be a list")
-    out: List[Link] = []
-    for i, it in enumerate(obj):
-        if not isinstance(it, dict):
-            raise ValueError(f"{ctx}[{i}] must be an object")
-        lid = it.get("id")
-        title = it.get("title")
-        if not isinstance(lid, int):
-            raise ValueError(f"{ctx}[{i}].id must be an integer")
-        if not isinstance(title, str) or title == "":
-            raise ValueError(f"{ctx}[{i}].title must be a non-empty string")
-        tr = _parse_lang_map(it.get("translate"), f"{ctx}[{i}].translate")
-        out.append(Link(id=lid, title=title, translate=tr))
-    return out
-
-def parse_messages(payload: Any) -> List[Message]:
+# Caps against pathological payloads. A valid feed nests 5 containers deep
+# (list > message > links > link > translate).
+MAX_DEPTH = 8
+MAX_MESSAGES = 100_000
+MAX_LINKS = 10_000
+
+# Mirrors the model above; compiled once at import, reused on every parse.
+_LANG_MAP_SCHEMA = {
+    "type": ["object", "null"],
+    "propertyNames": {"minLength": 1},
+    "additionalProperties": {"type": "string", "minLength": 1},
+}
+
+MESSAGES_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "array",
+    "maxItems": MAX_MESSAGES,
+    "items": {
+        "type": "object",
+        "required": ["id"],
+        "properties": {
+            "id": {"type": "integer"},
+            "image_id": {"type": ["integer", "null"]},
+            "text": {"type": ["string", "null"], "minLength": 1},
+            "links": {
+                "type": ["array", "null"],
+                "maxItems": MAX_LINKS,
+                "items": {
+                    "type": "object",
+                    "required": ["id", "title"],
+                    "properties": {
+                        "id": {"type": "integer"},
+                        "title": {"type": "string", "minLength": 1},
+                        "translate": _LANG_MAP_SCHEMA,
+                    },
+                },
+            },
+            "translate": _LANG_MAP_SCHEMA,
+        },
+    },
+}
+
+_VALIDATE = fastjsonschema.compile(MESSAGES_SCHEMA)
+
+# Legacy wording per field, as the hand-written validators reported it
+_FIELD_ERRORS = {
+    "id": "must be an integer",
+    "image_id": "must be an integer if provided",
+    "text": "must be a non-empty string if provided",
+    "title": "must be a non-empty string",
+    "translate": "must be an object/dict {lang: text}",
+}
+
+def _schema_error(e: fastjsonschema.JsonSchemaValueException) -> str:
+    # Rebuild the legacy "messages[0].links[1].title must be ..." text.
+    # e.path is e.name split on "." and "[", so a lang key like "pt.BR" comes
+    # apart; positions are taken from the fixed payload shape instead:
+    # [i, field] / [i, "links", j, field], a lang key only after "translate".
+    path = list(e.path[1:])
+    if e.rule == "required":
+        path.append(next(k for k in e.definition["required"] if k not in e.value))
+    if not path:
+        if e.rule == "type":
+            return "Root must be a JSON list: Messages[...]"
+        return "messages" + e.message[len("data"):]
+
+    ctx = f"messages[{path[0]}]"
+    name = f"data[{path[0]}]"
+    rest = path[1:]
+    if rest[:1] == ["links"] and len(rest) > 1:
+        ctx += f".links[{rest[1]}]"
+        name += f".links[{rest[1]}]"
+        rest = rest[2:]
+    # rest is now [] (the object itself), [field], or ["translate", *lang key]
+    if not rest:
+        if e.rule in ("type", "required"):
+            return f"{ctx} must be an object"
+        return "messages" + e.message[len("data"):]
+
+    field_name = rest[0]
+    ctx += f".{field_name}"
+    if field_name == "translate" and len(rest) > 1:
+        lang = e.name[len(f"{name}.translate."):]
+        return f"{ctx}[{lang}] must be a non-empty string"
+    if e.rule == "propertyNames":
+        return f"{ctx} keys must be non-empty strings (lang codes)"
+    if e.rule in ("type", "minLength", "required"):
+        if field_name == "links":
+            return f"{ctx} must be a list"
+        if field_name in _FIELD_ERRORS:
+            return f"{ctx} {_FIELD_ERRORS[field_name]}"
+    return "messages" + e.message[len("data"):]
+
+def _reject_float(value: Any, ctx: str, key: str) -> Any:
+    if isinstance(value, float):
+        raise ValueError(f"{ctx}.{key} {_FIELD_ERRORS[key]}")
+    return value
+
+def _too_deep(obj: Any, limit: int) -> bool:
+    # iterative on purpose: a recursive walk is what a deep payload would break
+    stack = [(obj, 1)]
+    while stack:
+        o, depth = stack.pop()
+        if depth > limit:
+            return True
+        for child in (o.values() if isinstance(o, dict) else o):
+            if isinstance(child, (dict, list)):
+                stack.append((child, depth + 1))
+    return False
+
+def parse_messages(payload: Any) -> ParsedFeed:
     """
     Root JSON is a LIST:
     [
@@ -94,163 +197,282 @@ def parse_messages(payload: Any) -> List[Message]:
       }
     ]
     """
-    if not isinstance(payload, list):
-        raise ValueError("Root must be a JSON list: Messages[...]")
+    if isinstance(payload, (dict, list)) and _too_deep(payload, MAX_DEPTH):
+        raise ValueError(f"Nesting too deep (max {MAX_DEPTH} levels)")
 
+    try:
+        _VALIDATE(payload)
+    except fastjsonschema.JsonSchemaValueException as e:
+        raise ValueError(_schema_error(e)) from None
+
+    # payload is valid here: plain mapping, only the integer check the schema
+    # cannot express (draft-06+ "integer" admits 1.0; the old parser did not)
     out: List[Message] = []
+    by_id: Dict[int, Message] = {}
     for i, it in enumerate(payload):
-        if not isinstance(it, dict):
-            raise ValueError(f"messages[{i}] must be an object")
-
-        mid = it.get("id")
-        if not isinstance(mid, int):
-            raise ValueError(f"messages[{i}].id must be an integer")
-
-        image_id = it.get("image_id")
-        if image_id is not None and not isinstance(image_id, int):
-            raise ValueError(f"messages[{i}].image_id must be an integer if provided")
-
-        text = it.get("text")
-        if text is not None and (not isinstance(text, str) or text == ""):
-            raise ValueError(f"messages[{i}].text must be a non-empty string if provided")
-
-        links = _parse_links(it.get("links"), f"messages[{i}].links")
-        tr = _parse_lang_map(it.get("translate"), f"messages[{i}].translate")
+        ctx = f"messages[{i}]"
+        links = it.get("links") or []
+        for j, lk in enumerate(links):
+            _reject_float(lk["id"], f"{ctx}.links[{j}]", "id")
+        msg = Message(
+            id=_reject_float(it["id"], ctx, "id"),
+            image_id=_reject_float(it.get("image_id"), ctx, "image_id"),
+            text=it.get("text"),
+            links=[
+                Link(id=lk["id"], title=lk["title"], translate=dict(lk.get("translate") or {}))
+                for lk in links
+            ],
+            translate=dict(it.get("translate") or {})
+        )
+        out.append(msg)
+        by_id[msg.id] = msg
+    return ParsedFeed(messages=out, by_id=by_id)
 
-        out.append(Message(
-            id=mid,
-            image_id=image_id,
-            text=text,
-            links=links,
-            translate=tr
-        ))
-    return out
+@st.cache_data(show_spinner=False)
+def _parse_cached(raw: str) -> Tuple[ParsedFeed, Tuple[str, ...]]:
+    """
+    orjson.loads + parse_messages (+ available langs) memoized on the raw JSON
+    text, so reruns with unchanged input skip validation. cache_data hands
+    every caller its own unpickled copy, so add_translation mutations stay
+    per-session.
+    """
+    # orjson is a hard requirement, not optional: it is stricter than json.loads
+    # (rejects NaN/Infinity and ints beyond 64 bits), and accepting a payload
+    # must not depend on which parser happens to be installed
+    feed = parse_messages(orjson.loads(raw))
+    return feed, tuple(collect_available_langs(feed.messages))
 
 
 # ---------------- UI helpers ----------------
 
+# Injected once per run; elements below only reference the classes.
+APP_CSS = """<style>
+.msg-text { font-family: "Source Code Pro", monospace; white-space: pre-wrap; margin-bottom: 1rem; }
+.msg-sep { border-top: 1px solid rgba(128, 128, 128, 0.25); margin: 8px 0; }
+.lnk-tr { margin: -6px 0 10px 12px; opacity: 0.9; font-size: 0.95em; }
+.link-btn { display: inline-block; margin: 0 0 10px; padding: 4px 12px; border-radius: 8px;
+            border: 1px solid rgba(128, 128, 128, 0.4); text-decoration: none; color: inherit; }
+</style>"""
+
 def collect_available_langs(messages: List[Message]) -> List[str]:
     langs: Set[str] = set()
     for m in messages:
         langs.update(m.translate.keys())
         for lk in m.links:
-            langs.update(lk.translate.keys())
+            langs.update(lk.sorted_langs)
     return sorted(langs)
 
-def show_overlay_error_if_any():
-    err = st.session_state.get("overlay_error")
-    if err:
-        with st.container():
-            st.error(err)
-            if st.button("Ok", key="overlay_ok"):
-                st.session_state["overlay_error"] = None
-                st.rerun()
+def _link_translations_html(lk: Link, selected_lang: Optional[str]) -> str:
+    parts = []
+    for lang in lk.sorted_langs:
+        label = html.escape(f"{lang}: {lk.translate[lang]}")
+        parts.append(f"<b>{label}</b>" if lang == selected_lang else label)
+    return "<div class='lnk-tr'>" + " · ".join(parts) + "</div>"
 
-def render_links_list(links: List[Link], selected_lang: Optional[str], provider: DataProvider, msg_id: int):
+def links_html(links: List[Link], selected_lang: Optional[str]) -> str:
     """
     2.2.1: list links: title first, then all translations.
     If selected_lang exists in link.translate => bold that translation.
-    Buttons in both "columns" lead to same action: provider.go_to(link.id).
+    Each title is an anchor to ?goto=<link.id>, picked up at app top
+    (same param as provider.go_to). Following it reloads the page, so
+    session state (extra langs, selected lang, drafts) does not carry over.
+    Escapes on every call: go through links_html_by_message / feed_html.
     """
+    parts = []
     for lk in links:
-        # Title as a button (go_to by id)
-        if st.button(lk.title, key=f"link_btn_{msg_id}_{lk.id}"):
-            provider.go_to(lk.id)
-
+        parts.append(
+            f"<div><a class='link-btn' href='?goto={lk.id}' target='_self'>"
+            f"{html.escape(lk.title)}</a></div>"
+        )
         if lk.translate:
-            parts = []
-            for lang in sorted(lk.translate.keys()):
-                t = lk.translate[lang]
-                label = f"{lang}: {t}"
-                if selected_lang is not None and lang == selected_lang:
-                    parts.append(f"<b>{html.escape(label)}</b>")
-                else:
-                    parts.append(html.escape(label))
-            st.markdown(
-                "<div style='margin: -6px 0 10px 12px; opacity: 0.9; font-size: 0.95em;'>"
-                + " · ".join(parts) +
-                "</div>",
-                unsafe_allow_html=True
-            )
+            parts.append(_link_translations_html(lk, selected_lang))
+    return "".join(parts)
 
-def render_message(message: Message, selected_lang: Optional[str], provider: DataProvider):
+@st.cache_resource(show_spinner=False, max_entries=32)
+def links_html_by_message(raw: str, selected_lang: Optional[str], _feed: ParsedFeed) -> Dict[int, str]:
     """
-    2.2: for each message output in order, skipping missing completely:
-      2.2.1 links (list)
-      2.2.2 image
-      2.2.3 text / translation editor logic
+    Message index -> links HTML for one (feed, selected_lang), built on
+    first use. Held by cache_resource, i.e. shared and never pickled: reruns
+    just look it up, and the cache_data'd parse result carries no derived
+    HTML. Read-only once built.
     """
-    # 2.2.1 links
-    if message.links:
-        render_links_list(message.links, selected_lang, provider, message.id)
+    return {i: links_html(m.links, selected_lang) for i, m in enumerate(_feed.messages) if m.links}
+
+# Served by Streamlit's static file server (server.enableStaticServing in
+# .streamlit/config.toml): ./static/<name> is reachable at app/static/<name>.
+STATIC_DIR = Path(__file__).parent / "static"
+
+_IMAGE_EXT = ((b"\x89PNG", "png"), (b"\xff\xd8", "jpg"), (b"RIFF", "webp"))
+
+def _static_image_name(image_id: int) -> Optional[str]:
+    for _, ext in _IMAGE_EXT:
+        name = f"img_{image_id}.{ext}"
+        if (STATIC_DIR / name).exists():
+            return name
+    return None
+
+def static_image_urls(image_ids: List[int], provider: DataProvider) -> Dict[int, str]:
+    """
+    image_id -> URL on the static file server. Bytes are fetched (one
+    provider.get_images call) and written only for ids not on disk yet;
+    after that the browser HTTP cache does the rest and reruns do no
+    server-side image work.
+    """
+    urls: Dict[int, str] = {}
+    missing: List[int] = []
+    for image_id in dict.fromkeys(image_ids):
+        name = _static_image_name(image_id)
+        if name is None:
+            missing.append(image_id)
+        else:
+            urls[image_id] = f"app/static/{name}"
+
+    if missing:
+        STATIC_DIR.mkdir(exist_ok=True)
+        for image_id, data in provider.get_images(missing).items():
+            ext = next((e for magic, e in _IMAGE_EXT if data.startswith(magic)), "png")
+            name = f"img_{image_id}.{ext}"
+            # Sessions run as threads of one process: write to a unique temp
+            # file, then atomically rename, so concurrent writers of the same
+            # image never clash and readers never see a partial file.
+            fd, tmp = tempfile.mkstemp(dir=STATIC_DIR, prefix=".img_", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, STATIC_DIR / name)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            urls[image_id] = f"app/static/{name}"
+    return urls
+
+def image_html(src: str) -> str:
+    """
+    <img> with native lazy loading: the browser defers fetching/decoding
+    until the image scrolls near the viewport (st.image always loads eagerly).
+    """
+    return f'<img loading="lazy" decoding="async" src="{html.escape(src)}" style="width:100%"/>'
+
+def _render_links_and_image(message: Message, links: Optional[str], images: Dict[int, str]):
+    # 2.2.1 links: all links of a message go out as one markdown element
+    if links:
+        st.markdown(links, unsafe_allow_html=True)
 
     # 2.2.2 image
     if message.image_id is not None:
-        st.image(provider.get_image(message.image_id), use_container_width=True)
+        st.markdown(image_html(images[message.image_id]), unsafe_allow_html=True)
 
-    # 2.2.3 text logic
-    native_text = message.text
-    if selected_lang is None:
-        # 2.2.3.1: show native text only
-        if native_text:
-            st.text(native_text)
+@st.fragment
+def _translation_cell(message: Message, selected_lang: str, placeholder: str, provider: DataProvider):
+    """
+    Right column of 2.2.3.2: existing translation, or editor + Save.
+    Runs as a fragment, so typing/Save here reruns only this cell instead of
+    the whole feed. Widget keys are unique per (message.id, selected_lang).
+    """
+    existing = message.translate.get(selected_lang)
+    if existing:
+        st.text(existing)
         return
 
-    # 2.2.3.2: selected lang -> show "table without header" 2 cols (original vs translation/edit)
-    if not native_text:
-        # No native text => nothing to show in this section
-        return
+    # editor + save
+    # the widget keeps the draft in session_state under its own key
+    draft_key = f"ta_{message.id}_{selected_lang}"
+    st.text_area(
+        "",
+        key=draft_key,
+        placeholder=placeholder,
+        height=120
+    )
+
+    if st.button("Save", key=f"save_{message.id}_{selected_lang}"):
+        candidate = (st.session_state[draft_key] or "").strip()
+        if not candidate:
+            st.toast("Translation is empty.", icon="⚠️")
+            return
+
+        err = provider.add_translation(message.id, selected_lang, candidate)
+        if err is not None:
+            st.toast(err, icon="⚠️")
+            return
+
+        # success -> update UI as if translation exists; only this cell changes
+        message.translate[selected_lang] = candidate
+        st.rerun(scope="fragment")
+
+def make_message_renderer(selected_lang: str) -> Callable[[Message, Optional[str], DataProvider, Dict[int, str]], None]:
+    """
+    2.2: for each message output in order, skipping missing completely:
+      2.2.1 links (prebuilt HTML, see links_html_by_message)
+      2.2.2 image (`images` maps image_id -> URL, see static_image_urls)
+      2.2.3 text / translation editor logic
 
-    left, right = st.columns(2, vertical_alignment="top")
-    with left:
-        st.text(native_text)
+    Used only when a language is selected (the read-only view goes through
+    feed_html). selected_lang is fixed for the whole render loop, so it is
+    bound once here and the returned function is called per message.
+    """
+    placeholder = f"Enter translation ({selected_lang})…"
 
-    with right:
-        existing = message.translate.get(selected_lang)
-        if existing:
-            st.text(existing)
-        else:
-            # editor + save
-            draft_key = f"draft_tr_{message.id}_{selected_lang}"
-            if draft_key not in st.session_state:
-                st.session_state[draft_key] = ""
-
-            st.session_state[draft_key] = st.text_area(
-                "",
-                value=st.session_state[draft_key],
-                key=f"ta_{message.id}_{selected_lang}",
-                placeholder=f"Enter translation ({selected_lang})…",
-                height=120
-            )
+    def render_with_lang(message: Message, links: Optional[str], provider: DataProvider,
+                         images: Dict[int, str]):
+        _render_links_and_image(message, links, images)
+
+        # 2.2.3.2: selected lang -> show "table without header" 2 cols (original vs translation/edit)
+        native_text = message.text
+        if not native_text:
+            # No native text => nothing to show in this section
+            return
+
+        left, right = st.columns(2, vertical_alignment="top")
+        with left:
+            st.text(native_text)
+
+        with right:
+            _translation_cell(message, selected_lang, placeholder, provider)
 
-            if st.button("Save", key=f"save_{message.id}_{selected_lang}"):
-                candidate = (st.session_state[draft_key] or "").strip()
-                if not candidate:
-                    st.session_state["overlay_error"] = "Translation is empty."
-                    st.rerun()
+    return render_with_lang
 
-                err = provider.add_translation(message.id, selected_lang, candidate)
-                if err is None:
-                    # success -> update UI as if translation exists
-                    message.translate[selected_lang] = candidate
-                    st.rerun()
-                else:
-                    st.session_state["overlay_error"] = err
-                    st.rerun()
+@st.cache_data(show_spinner=False)
+def feed_html(raw: str, images: Dict[int, str], _feed: ParsedFeed) -> str:
+    """
+    Read-only view (selected_lang is None) of the whole feed as one HTML
+    string, emitted as a single markdown element instead of several per
+    message. Pure: keyed on the raw JSON text (the feed is derived from it)
+    and the image URLs, which the caller resolves. add_translation never
+    affects this view: it only touches Message.translate, which the native
+    view does not show.
+    """
+    parts = []
+    for m in _feed.messages:
+        if m.links:
+            parts.append(links_html(m.links, None))
+        if m.image_id is not None:
+            parts.append(image_html(images[m.image_id]))
+        if m.text:
+            # no raw line endings (\n, \r, \r\n, ...): a blank line would end
+            # the HTML block in markdown
+            text = "<br/>".join(html.escape(m.text).splitlines())
+            parts.append(f"<div class='msg-text'>{text}</div>")
+        parts.append("<div class='msg-sep'></div>")
+    return "<div>" + "".join(parts) + "</div>"
 
 
 # ---------------- Demo provider ----------------
 
+# Tiny valid 1x1 PNG for offline demo, decoded once at import
+_ONE_PX_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mP8/x8AAwMB/6Xf1n8AAAAASUVORK5CYII="
+)
+
 class DemoProvider:
-    def __init__(self, messages: List[Message]):
-        self._messages = {m.id: m for m in messages}
+    def __init__(self, feed: ParsedFeed):
+        # index is built once at parse time; keep it by reference
+        self._messages = feed.by_id
 
     def get_image(self, image_id: int) -> bytes:
-        # Tiny valid 1x1 PNG for offline demo
-        import base64
-        return base64.b64decode(
-            "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mP8/x8AAwMB/6Xf1n8AAAAASUVORK5CYII="
-        )
+        return _ONE_PX_PNG
+
+    def get_images(self, image_ids: List[int]) -> Dict[int, bytes]:
+        return {image_id: self.get_image(image_id) for image_id in image_ids}
 
     def go_to(self, message_id: int) -> None:
         # Just store target; real app can scroll/jump/load branch/etc.
@@ -260,7 +482,7 @@ class DemoProvider:
 
     def add_translation(self, message_id: int, lang: str, translation: str) -> Optional[str]:
         # Demo "DB write" simulation
-        # Return string on error to demonstrate overlay
+        # Return string on error to demonstrate the error toast
         if len(translation) > 5000:
             return "Translation is too long."
         msg = self._messages.get(message_id)
@@ -274,7 +496,18 @@ class DemoProvider:
 # ---------------- App ----------------
 
 st.set_page_config(layout="wide")
-show_overlay_error_if_any()
+st.markdown(APP_CSS, unsafe_allow_html=True)
+
+# Link anchors navigate with ?goto=<message_id>. This is a full page load
+# (new session), so it is handled here rather than through DataProvider.go_to,
+# which expects a live session and reruns it.
+goto = st.query_params.get("goto")
+if goto is not None:
+    try:
+        st.session_state["goto_message_id"] = int(goto)
+    except ValueError:
+        pass  # malformed link, ignore
+    del st.query_params["goto"]
 
 # Demo JSON input
 example = [
@@ -300,8 +533,8 @@ example = [
 raw = st.text_area("Messages JSON (list)", value=json.dumps(example, ensure_ascii=False, indent=2), height=240)
 
 if st.button("Render"):
-    payload = json.loads(raw)
-    messages = parse_messages(payload)
+    feed, base_langs = _parse_cached(raw)
+    messages = feed.messages
 
     # Keep "extra languages" only in-memory for this session (temporary dict/set)
     st.session_state.setdefault("extra_langs", set())
@@ -309,8 +542,8 @@ if st.button("Render"):
     # --- Two-row "table" (no title, no global columns) ---
     # Row 1: translation select + add language
     with st.container():
-        base_langs = collect_available_langs(messages)
-        all_langs = ["<None>"] + sorted(set(base_langs) | set(st.session_state["extra_langs"]))
+        # a handful of strings: sorting inline is cheaper than any memo
+        all_langs = ("<None>",) + tuple(sorted(set(base_langs) | st.session_state["extra_langs"]))
 
         # default is <None>
         current = st.session_state.get("selected_lang", "<None>")
@@ -339,25 +572,32 @@ if st.button("Render"):
                 if st.button("Save language", key="save_lang_btn"):
                     nl = (new_lang or "").strip()
                     if not nl:
-                        st.session_state["overlay_error"] = "Language name is empty."
+                        st.toast("Language name is empty.", icon="⚠️")
+                    else:
+                        st.session_state["extra_langs"].add(nl)
+                        st.session_state["selected_lang"] = nl
+                        st.session_state["adding_lang"] = False
                         st.rerun()
-                    st.session_state["extra_langs"].add(nl)
-                    st.session_state["selected_lang"] = nl
-                    st.session_state["adding_lang"] = False
-                    st.rerun()
 
         # c4 left empty intentionally (to keep row compact)
 
     # Row 2: render messages in order
     with st.container():
-        provider = DemoProvider(messages)
+        provider = DemoProvider(feed)
         chosen = st.session_state.get("selected_lang", "<None>")
         selected_lang: Optional[str] = None if chosen == "<None>" else chosen
 
-        for m in messages:
-            render_message(m, selected_lang, provider)
-            # lightweight separator
-            st.markdown("<hr style='opacity:0.25'/>", unsafe_allow_html=True)
+        images = static_image_urls([m.image_id for m in messages if m.image_id is not None], provider)
+        if selected_lang is None:
+            # read-only: whole feed as a single element
+            st.markdown(feed_html(raw, images, feed), unsafe_allow_html=True)
+        else:
+            links = links_html_by_message(raw, selected_lang, feed)
+            render_message = make_message_renderer(selected_lang)
+            for i, m in enumerate(messages):
+                render_message(m, links.get(i), provider, images)
+                # lightweight separator
+                st.markdown("<div class='msg-sep'></div>", unsafe_allow_html=True)
 
 # Debug: where go_to points
 if "goto_message_id" in st.session_state: